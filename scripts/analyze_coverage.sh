@@ -2,6 +2,9 @@
 
 # Script to analyze coverage using open-source tools (Verilator) or Vivado
 
+# Work from the project root so relative paths do not depend on the caller's directory
+cd "$(dirname "$0")/.." || exit 1
+
 # Check for the existence of necessary directories
 if [ ! -d "src/rtl" ] || [ ! -d "src/tb" ]; then
     echo "RTL or Testbench directories not found!"
@@ -2,6 +2,9 @@
 
 # Script to run simulations using open-source tools (Icarus Verilog) or Vivado
 
+# Work from the project root so relative paths do not depend on the caller's directory
+cd "$(dirname "$0")/.." || exit 1
+
 # Check for the existence of necessary directories
 if [ ! -d "src/rtl" ] || [ ! -d "src/tb" ]; then
     echo "RTL or Testbench directories not found!"
@@ -18,22 +21,78 @@ LOG_DIR="$SIM_DIR/logs"
 # Create directories if they don't exist
 mkdir -p $WAVEFORM_DIR $LOG_DIR
 
+# Waveform viewer opened for each VCD produced (set WAVE_VIEWER= to disable)
+WAVE_VIEWER=${WAVE_VIEWER-/Applications/surfer}
+
+# Number of testbenches to simulate concurrently (defaults to the CPU count)
+JOBS=${JOBS:-$(getconf _NPROCESSORS_ONLN 2>/dev/null || echo 1)}
+
+# Fall back to one job at a time if JOBS is not a positive integer
+if ! [[ $JOBS =~ ^[0-9]+$ ]] || [ $((10#$JOBS)) -lt 1 ]; then
+    echo "Invalid JOBS value '$JOBS', running one testbench at a time"
+    JOBS=1
+fi
+JOBS=$((10#$JOBS))
+
+# Function to compile and simulate a single testbench with Icarus Verilog
+run_icarus_testbench() {
+    local tb_file=$1
+    local tb_name=$(basename $tb_file .sv)
+    iverilog -o $SIM_DIR/${tb_name}.vvp -s ${tb_name} $RTL_DIR/*.v $tb_file
+    vvp $SIM_DIR/${tb_name}.vvp > $LOG_DIR/${tb_name}.log
+
+    # Move VCD files to waveform directory if they exist
+    if [ -f ${tb_name}.vcd ]; then
+        mv ${tb_name}.vcd $WAVEFORM_DIR/
+    fi
+
+    # Open the waveform file in the viewer, detached from this script's output
+    if [ -f $WAVEFORM_DIR/${tb_name}.vcd ] && command -v "$WAVE_VIEWER" &> /dev/null; then
+        "$WAVE_VIEWER" $WAVEFORM_DIR/${tb_name}.vcd < /dev/null &> /dev/null &
+    fi
+}
+
+# Function to freeze a process and all of its descendants, printing their PIDs
+# Each process is stopped before its children are listed so it cannot start new ones meanwhile
+freeze_process_tree() {
+    kill -STOP $1 2> /dev/null || return
+    echo $1
+    for child in $(pgrep -P $1); do
+        freeze_process_tree $child
+    done
+}
+
+# Function to stop every testbench that is still running, along with everything it started
+stop_icarus_simulation() {
+    # Only jobs bash still reports as running, so PIDs of reaped jobs are never signalled
+    local running=$(jobs -pr)
+    local tree=$(for pid in $running; do freeze_process_tree $pid; done)
+    kill -TERM $tree 2> /dev/null
+    kill -CONT $tree 2> /dev/null
+}
+
 # Function to run simulation with Icarus Verilog
+# Testbenches are independent, so up to $JOBS of them run at the same time
 run_icarus_simulation() {
-    echo "Running simulations with Icarus Verilog..."
-    for tb_file in $TB_DIR/*.sv; do
-        tb_name=$(basename $tb_file .sv)
-        iverilog -o $SIM_DIR/${tb_name}.vvp -s ${tb_name} $RTL_DIR/*.v $tb_file
-        vvp $SIM_DIR/${tb_name}.vvp > $LOG_DIR/${tb_name}.log
+    echo "Running simulations with Icarus Verilog ($JOBS parallel jobs)..."
+    local pids=()
 
-        # Move VCD files to waveform directory if they exist
-        if [ -f ${tb_name}.vcd ]; then
-            mv ${tb_name}.vcd $WAVEFORM_DIR/
-        fi
+    # Take the running testbenches down with the script instead of orphaning the simulators
+    trap 'stop_icarus_simulation; exit 130' INT
+    trap 'stop_icarus_simulation; exit 143' TERM
 
-        # Open the waveform file with Surfer
-        /Applications/surfer $WAVEFORM_DIR/${tb_name}.vcd &
+    for tb_file in $TB_DIR/*.sv; do
+        # Wait for the oldest testbench to finish once all job slots are taken
+        if [ ${#pids[@]} -ge $JOBS ]; then
+            wait ${pids[0]}
+            pids=("${pids[@]:1}")
+        fi
+        run_icarus_testbench $tb_file &
+        pids+=($!)
     done
+    wait
+
+    trap - INT TERM
 }
 
 # Function to run simulation with Vivado
@@ -2,6 +2,9 @@
 
 # Script to run synthesis using open-source tools (Yosys) or Vivado
 
+# Work from the project root so relative paths do not depend on the caller's directory
+cd "$(dirname "$0")/.." || exit 1
+
 # Check for the existence of necessary directories
 if [ ! -d "src/rtl" ]; then
     echo "RTL directory not found!"